@@ -0,0 +1,16 @@
+-- Migration: Cover latest-snapshot and per-game odds reads with one outcome index
+-- The closing-line query picks the latest snapshot per outcome, and per-game odds
+-- are read by walking markets(game_id) -> outcomes -> snapshots; including the
+-- odds columns lets both be index-only scans in timestamp order instead of
+-- visiting the odds_snapshots heap
+--
+-- CONCURRENTLY keeps odds collection writing while the index builds, so run this
+-- file outside a transaction (e.g. psql -f, not psql -1). If the build fails,
+-- drop the invalid idx_odds_outcome_timestamp_covering before running it again
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_odds_outcome_timestamp_covering
+    ON odds_snapshots(outcome_id, timestamp DESC)
+    INCLUDE (decimal_odds, raw_probability, devigged_probability, devigged_decimal_odds, is_closing_line);
+
+-- Superseded by the covering index above
+DROP INDEX CONCURRENTLY IF EXISTS idx_odds_outcome_timestamp;
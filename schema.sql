@@ -106,7 +106,7 @@ CREATE INDEX idx_games_sport_start_time ON games(sport, game_start_time);
 CREATE INDEX idx_games_status_outcome ON games(game_status, actual_outcome);
 CREATE INDEX idx_markets_game_platform ON markets(game_id, platform_id);
 CREATE INDEX idx_outcomes_market_type ON outcomes(market_id, outcome_type);
-CREATE INDEX idx_odds_outcome_timestamp ON odds_snapshots(outcome_id, timestamp);
+CREATE INDEX idx_odds_outcome_timestamp_covering ON odds_snapshots(outcome_id, timestamp DESC) INCLUDE (decimal_odds, raw_probability, devigged_probability, devigged_decimal_odds, is_closing_line);
 CREATE INDEX idx_odds_timestamp ON odds_snapshots(timestamp);
 CREATE INDEX idx_odds_closing_lines ON odds_snapshots(is_closing_line) WHERE is_closing_line = TRUE;
 
@@ -0,0 +1,100 @@
+"""Recompute stored de-vigged odds with the corrected constant exponent search.
+
+Before the exponent search was fixed, devig_odds bisected k in [0, 1] and
+converged to k = 1 for any book with vig, so every snapshot collected up to
+then has devigged_probability equal to its raw_probability. This script
+re-de-vigs those snapshots in place.
+
+Snapshots of one market that were collected within a minute of each other
+are treated as one collection run. Outcomes missing from a run (skipped as
+unchanged duplicates) use their most recent earlier odds.
+
+Usage:
+    python src/backfill_devig.py
+"""
+
+import os
+import sys
+from datetime import timedelta
+from typing import Dict, List, Tuple
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config.database import db_manager
+from src.utils.odds import OddsTable, devig_odds_soa
+
+# Snapshots of a market this close together belong to the same collection run
+RUN_WINDOW = timedelta(minutes=1)
+
+
+def _collection_runs(rows) -> Tuple[List[List[int]], List[List[float]]]:
+    """
+    Split snapshots ordered by market and timestamp into collection runs.
+
+    Returns, per run, the snapshot ids to update and the decimal odds of
+    every outcome the market has quoted so far, updated snapshots first.
+    """
+    run_ids, run_odds = [], []
+    market_id = None
+    latest_odds: Dict[int, float] = {}
+    current: Dict[int, Tuple[int, float]] = {}
+    run_start = None
+
+    def close_run():
+        if not current:
+            return
+        latest_odds.update({outcome_id: odds for outcome_id, (_, odds) in current.items()})
+        others = [odds for outcome_id, odds in latest_odds.items() if outcome_id not in current]
+        run_ids.append([snapshot_id for snapshot_id, _ in current.values()])
+        run_odds.append([odds for _, odds in current.values()] + others)
+        current.clear()
+
+    for row_market_id, outcome_id, snapshot_id, timestamp, decimal_odds in rows:
+        new_market = row_market_id != market_id
+        if new_market or timestamp - run_start > RUN_WINDOW or outcome_id in current:
+            close_run()
+            if new_market:
+                market_id = row_market_id
+                latest_odds = {}
+            run_start = timestamp
+        current[outcome_id] = (snapshot_id, decimal_odds)
+
+    close_run()
+    return run_ids, run_odds
+
+
+def backfill_devigged_odds():
+    """Recompute devigged_probability and devigged_decimal_odds for every snapshot."""
+    query = """
+        SELECT o.market_id, os.outcome_id, os.id, os.timestamp, os.decimal_odds::double precision
+        FROM odds_snapshots os
+        JOIN outcomes o ON os.outcome_id = o.id
+        WHERE os.decimal_odds > 0
+        ORDER BY o.market_id, os.timestamp
+    """
+
+    rows = db_manager.execute_query(query) or []
+    run_ids, run_odds = _collection_runs(rows)
+    print(f"Re-de-vigging {len(rows)} snapshots in {len(run_ids)} collection runs")
+
+    markets = [[{'decimal_odds': odds} for odds in outcome_odds] for outcome_odds in run_odds]
+    devig_odds_soa(OddsTable.from_list_of_dicts(markets)).to_list_of_dicts(markets)
+
+    updates = [
+        (outcome['devigged_probability'], outcome['devigged_decimal_odds'], snapshot_id)
+        for ids, outcomes in zip(run_ids, markets)
+        for snapshot_id, outcome in zip(ids, outcomes)
+    ]
+
+    db_manager.execute_batch("""
+        UPDATE odds_snapshots
+        SET devigged_probability = %s, devigged_decimal_odds = %s
+        WHERE id = %s
+    """, updates, page_size=500)
+
+    print(f"Updated {len(updates)} snapshots")
+
+
+if __name__ == "__main__":
+    backfill_devigged_odds()
@@ -1,5 +1,6 @@
 import os
 import psycopg2
+import psycopg2.extras
 from psycopg2.pool import SimpleConnectionPool
 from dotenv import load_dotenv
 
@@ -45,6 +46,18 @@ class DatabaseManager:
         finally:
             self.return_connection(conn)
     
+    def execute_batch(self, query, params_list, page_size=100):
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cursor:
+                psycopg2.extras.execute_batch(cursor, query, params_list, page_size=page_size)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            self.return_connection(conn)
+    
     def test_connection(self):
         try:
             conn = self.get_connection()
@@ -560,6 +560,9 @@ class OddsAnalysisOrchestrator:
         # Get recent scores from The Odds API
         scores = self.odds_api.get_scores(days_from=3)
         
+        # Collect (game_id, home_score, away_score, outcome) for a single batched update
+        completed_results = []
+        
         for score_data in scores:
             if score_data.get('completed'):
                 try:
@@ -581,11 +584,19 @@ class OddsAnalysisOrchestrator:
                                 away_score = score['score']
                         
                         if home_score is not None and away_score is not None:
-                            game.update_outcome(int(home_score), int(away_score))
-                            print(f"Updated game: {game.away_team} @ {game.home_team} - {away_score}-{home_score}")
+                            home_score, away_score = int(home_score), int(away_score)
+                            outcome = Game.outcome_from_scores(home_score, away_score)
+                            completed_results.append((game.id, home_score, away_score, outcome))
+                            print(f"Completed game: {game.away_team} @ {game.home_team} - {away_score}-{home_score}")
                 
                 except Exception as e:
                     print(f"Error updating completed game: {e}")
+        
+        try:
+            Game.update_outcomes_bulk(completed_results)
+            print(f"Updated {len(completed_results)} completed games")
+        except Exception as e:
+            print(f"Error updating completed games: {e}")
 
 
 def main():
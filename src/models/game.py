@@ -1,9 +1,10 @@
 """Game model for database operations."""
 
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, date
 from src.config.database import db_manager
-from src.models.team import Team, normalize_team_name_for_matching
+from src.models.team import Team, normalize_team_name_for_matching, _fast_normalize
 
 
 class Game:
@@ -45,7 +46,7 @@ class Game:
             WHERE sport = %s 
             AND home_team_id = %s 
             AND away_team_id = %s 
-            AND ABS(EXTRACT(EPOCH FROM (game_start_time - %s))) <= 1800  -- 30 minutes = 1800 seconds
+            AND game_start_time BETWEEN %s - INTERVAL '30 minutes' AND %s + INTERVAL '30 minutes'
             ORDER BY ABS(EXTRACT(EPOCH FROM (game_start_time - %s))) ASC
             LIMIT 1
         """
@@ -55,7 +56,8 @@ class Game:
             game_data['sport'],
             home_team.id,
             away_team.id,
-            game_data['game_start_time'],  # For time comparison
+            game_data['game_start_time'],  # For time window start
+            game_data['game_start_time'],  # For time window end
             game_data['game_start_time']   # For ordering
         ))
         
@@ -88,27 +90,12 @@ class Game:
                 RETURNING *
             """
             
-            # Determine season based on game date
-            game_year = game_data['game_start_time'].year
-            # MLB season typically starts in March/April and ends in October/November
-            # So games in Jan-Feb are usually spring training or previous season playoffs
-            if game_data['game_start_time'].month <= 2:
-                season = str(game_year - 1)  # Early year games are previous season
-            else:
-                season = str(game_year)
-            
-            # Ensure game_start_time is in UTC
-            game_start_time_utc = cls._ensure_utc_time(game_data['game_start_time'])
-            
-            # Calculate local game time using home team's timezone
-            game_start_time_local = cls._convert_to_local_time(
-                game_start_time_utc, 
+            # Derive UTC/local start times, local date and season
+            game_start_time_utc, game_start_time_local, game_date_local, season = cls._compute_derived(
+                game_data['game_start_time'],
                 home_team.timezone
             )
             
-            # Extract local date from local game time
-            game_date_local = game_start_time_local.date()
-            
             params = (
                 game_data['sport'],
                 game_data['league'],
@@ -146,20 +133,43 @@ class Game:
             print(f"Game data: {game_data}")
             raise e
     
+    @classmethod
+    def _compute_derived(cls, game_start_time: datetime, local_timezone: str) -> Tuple[datetime, datetime, date, str]:
+        """
+        Compute derived time fields for a game.
+        
+        Args:
+            game_start_time: Game start time (naive times are assumed to be UTC)
+            local_timezone: IANA timezone name of the home team
+            
+        Returns:
+            Tuple of (game_start_time_utc, game_start_time_local,
+            game_date_local, season)
+        """
+        game_start_time_utc = cls._ensure_utc_time(game_start_time)
+        game_start_time_local = game_start_time_utc.astimezone(_tz(local_timezone))
+        
+        return game_start_time_utc, game_start_time_local, game_start_time_local.date(), _season_for(game_start_time)
+    
     @staticmethod
     def normalize_team_name(team_name: str) -> str:
         """Normalize team name for cross-platform matching using database."""
         canonical_name = normalize_team_name_for_matching(team_name)
-        return canonical_name if canonical_name else team_name.lower().strip()
+        return canonical_name if canonical_name else _fast_normalize(team_name)
     
-    def update_outcome(self, home_score: int, away_score: int):
-        """Update game with final outcome and mark closing lines."""
+    @staticmethod
+    def outcome_from_scores(home_score: int, away_score: int) -> str:
+        """Determine the game outcome from the final score."""
         if home_score > away_score:
-            outcome = 'home_win'
+            return 'home_win'
         elif away_score > home_score:
-            outcome = 'away_win'
+            return 'away_win'
         else:
-            outcome = 'draw'
+            return 'draw'
+    
+    def update_outcome(self, home_score: int, away_score: int):
+        """Update game with final outcome and mark closing lines."""
+        outcome = self.outcome_from_scores(home_score, away_score)
         
         # Update game outcome
         query = """
@@ -179,27 +189,84 @@ class Game:
         self.away_score = away_score
         self.game_status = 'completed'
     
+    @classmethod
+    def update_outcomes_bulk(cls, results: List[Tuple[int, int, int, str]]):
+        """
+        Update final outcomes for many games and mark their closing lines.
+        
+        Args:
+            results: List of (game_id, home_score, away_score, outcome) tuples
+        """
+        if not results:
+            return
+        
+        query = """
+            UPDATE games 
+            SET actual_outcome = %s, home_score = %s, away_score = %s, 
+                game_status = 'completed', updated_at = CURRENT_TIMESTAMP
+            WHERE id = %s
+        """
+        
+        rows = [
+            (outcome, home_score, away_score, game_id)
+            for game_id, home_score, away_score, outcome in results
+        ]
+        db_manager.execute_batch(query, rows, page_size=200)
+        
+        cls.mark_closing_lines_bulk([game_id for game_id, _, _, _ in results])
+    
+    @classmethod
+    def mark_closing_lines_bulk(cls, game_ids: List[int]):
+        """Mark closing lines for many games in a single statement."""
+        if not game_ids:
+            return
+        
+        # Same rules as _mark_closing_lines, using each game's own start time
+        query = """
+            WITH latest_odds AS (
+                SELECT DISTINCT ON (os.outcome_id)
+                    os.outcome_id,
+                    os.timestamp
+                FROM odds_snapshots os
+                JOIN outcomes o ON os.outcome_id = o.id
+                JOIN markets m ON o.market_id = m.id
+                JOIN games g ON m.game_id = g.id
+                WHERE m.game_id = ANY(%s)
+                AND os.timestamp <= g.game_start_time
+                AND os.timestamp >= g.game_start_time - INTERVAL '60 minutes'
+                ORDER BY os.outcome_id, os.timestamp DESC
+            )
+            UPDATE odds_snapshots 
+            SET is_closing_line = TRUE
+            WHERE (outcome_id, timestamp) IN (
+                SELECT outcome_id, timestamp FROM latest_odds
+            )
+        """
+        
+        db_manager.execute_query(query, (list(game_ids),))
+        print(f"Marked closing lines for {len(game_ids)} games")
+    
     def _mark_closing_lines(self):
         """Mark the final odds snapshot before game start as closing lines."""
         # For each outcome in each market for this game, find the latest odds before game start
         # that was collected within 1 hour of game start, and mark it as the closing line
         query = """
             WITH latest_odds AS (
-                SELECT 
+                SELECT DISTINCT ON (os.outcome_id)
                     os.outcome_id,
-                    MAX(os.timestamp) as max_timestamp
+                    os.timestamp
                 FROM odds_snapshots os
                 JOIN outcomes o ON os.outcome_id = o.id
                 JOIN markets m ON o.market_id = m.id
                 WHERE m.game_id = %s 
                 AND os.timestamp <= %s
                 AND os.timestamp >= %s - INTERVAL '60 minutes'
-                GROUP BY os.outcome_id
+                ORDER BY os.outcome_id, os.timestamp DESC
             )
             UPDATE odds_snapshots 
             SET is_closing_line = TRUE
             WHERE (outcome_id, timestamp) IN (
-                SELECT outcome_id, max_timestamp FROM latest_odds
+                SELECT outcome_id, timestamp FROM latest_odds
             )
         """
         
@@ -220,20 +287,20 @@ class Game:
         else:
             # Already in UTC
             return dt
+
+
+@lru_cache(maxsize=None)
+def _tz(tzname: str):
+    """Resolve an IANA timezone name, caching the tzinfo object."""
+    import pytz
     
-    @staticmethod
-    def _convert_to_local_time(utc_time, local_timezone: str):
-        """Convert UTC time to local timezone."""
-        from datetime import timezone
-        import pytz
-        
-        # Ensure the input time is timezone-aware
-        if utc_time.tzinfo is None:
-            utc_time = utc_time.replace(tzinfo=timezone.utc)
-        elif utc_time.tzinfo != timezone.utc:
-            # Convert to UTC first if it's in a different timezone
-            utc_time = utc_time.astimezone(timezone.utc)
-        
-        # Convert to local timezone
-        local_tz = pytz.timezone(local_timezone)
-        return utc_time.astimezone(local_tz)
\ No newline at end of file
+    return pytz.timezone(tzname)
+
+
+def _season_for(game_start_time: datetime) -> str:
+    """Determine the season a game belongs to from its start time."""
+    # MLB season typically starts in March/April and ends in October/November
+    # So games in Jan-Feb are usually spring training or previous season playoffs
+    if game_start_time.month <= 2:
+        return str(game_start_time.year - 1)  # Early year games are previous season
+    return str(game_start_time.year)
@@ -1,9 +1,22 @@
 """Team model for database operations."""
 
 import re
-from typing import List, Dict, Optional, Tuple
+from typing import Any, List, Dict, Optional, Pattern, Set, Tuple
 from src.config.database import db_manager
 
+# Teams per sport, loaded once from the teams table; reset with Team.clear_cache()
+_TEAMS: Dict[str, List['Team']] = {}
+
+# Compiled find_teams_in_text matchers per sport, built from _TEAMS
+_TEXT_MATCHERS: Dict[str, Dict[str, Any]] = {}
+
+# Exact-match lookup of canonical names, abbreviations and keywords per sport, built from _TEAMS
+_KEYWORD_INDEX: Dict[str, Dict[str, 'Team']] = {}
+
+# Canonical names already resolved by normalize_team_name_for_matching per sport.
+# Only hits are stored, so names resolve once their team or keyword is added
+_CANONICAL_NAMES: Dict[str, Dict[str, str]] = {}
+
 
 class Team:
     def __init__(self, **kwargs):
@@ -23,34 +36,12 @@ class Team:
         if not team_name:
             return None
         
-        team_lower = team_name.lower().strip()
+        team_lower = _fast_normalize(team_name)
         
-        # Try exact match on canonical name first
-        query = """
-            SELECT * FROM teams 
-            WHERE sport = %s AND LOWER(canonical_name) = %s
-        """
-        result = db_manager.execute_query(query, (sport, team_lower))
-        if result:
-            return cls._create_from_row(result[0])
-        
-        # Try abbreviation match
-        query = """
-            SELECT * FROM teams 
-            WHERE sport = %s AND LOWER(abbreviation) = %s
-        """
-        result = db_manager.execute_query(query, (sport, team_lower))
-        if result:
-            return cls._create_from_row(result[0])
-        
-        # Try keywords match using PostgreSQL array operators
-        query = """
-            SELECT * FROM teams 
-            WHERE sport = %s AND %s = ANY(keywords)
-        """
-        result = db_manager.execute_query(query, (sport, team_lower))
-        if result:
-            return cls._create_from_row(result[0])
+        # Try exact match on canonical name, abbreviation, then keywords
+        team = cls._get_keyword_index(sport).get(team_lower)
+        if team:
+            return team
         
         # Try partial matches in keywords (for cases where input might be slightly different)
         query = """
@@ -81,55 +72,109 @@ class Team:
         
         return None
     
+    @classmethod
+    def _get_keyword_index(cls, sport: str) -> Dict[str, 'Team']:
+        """Get the lowercase name -> Team index for a sport, building it on first use."""
+        keyword_index = _KEYWORD_INDEX.get(sport)
+        if keyword_index is not None:
+            return keyword_index
+        
+        teams = cls._get_cached_teams(sport)
+        if not teams:
+            return {}
+        
+        # Insert in match priority order so an earlier kind of match always wins
+        keyword_index = {}
+        for team in teams:
+            keyword_index.setdefault(team.canonical_name.lower(), team)
+        for team in teams:
+            if team.abbreviation:
+                keyword_index.setdefault(team.abbreviation.lower(), team)
+        for team in teams:
+            for keyword in team.keywords or []:
+                keyword_index.setdefault(keyword, team)
+        
+        _KEYWORD_INDEX[sport] = keyword_index
+        return keyword_index
+    
     @classmethod
     def find_teams_in_text(cls, text: str, sport: str = 'mlb') -> List['Team']:
         """Find team names mentioned in text using smart matching."""
         text_lower = text.lower()
         found_teams = []
+        seen_ids = set()
         
-        # Get all teams for the sport
-        query = "SELECT * FROM teams WHERE sport = %s ORDER BY LENGTH(canonical_name) DESC"
-        results = db_manager.execute_query(query, (sport,))
-        
-        if not results:
+        matchers = cls._get_text_matchers(sport)
+        if not matchers:
             return found_teams
         
-        teams = [cls._create_from_row(row) for row in results]
+        # Match all abbreviations and short keywords with one regex pass each
+        abbreviation_hits = _regex_hits(
+            matchers['abbreviation_re'], matchers['abbreviation_to_team_ids'], text_lower
+        )
+        short_keyword_hits = _regex_hits(
+            matchers['short_keyword_re'], matchers['short_keyword_to_team_ids'], text_lower
+        )
         
-        # First check for abbreviations with word boundaries
-        for team in teams:
-            if team.abbreviation:
-                pattern = r'\b' + re.escape(team.abbreviation.lower()) + r'\b'
-                if re.search(pattern, text_lower):
-                    if team not in found_teams:
-                        found_teams.append(team)
+        # First take teams found by abbreviation
+        for team in matchers['teams']:
+            if team.id in abbreviation_hits:
+                seen_ids.add(team.id)
+                found_teams.append(team)
         
-        # Then check for keywords and names
-        for team in teams:
-            if team in found_teams:
+        # Then check for names and keywords
+        for team, canonical_lower, long_keywords in matchers['long_keywords']:
+            if team.id in seen_ids:
                 continue  # Already found via abbreviation
             
-            # Check canonical name
-            if team.canonical_name.lower() in text_lower:
+            if (
+                canonical_lower in text_lower
+                or team.id in short_keyword_hits
+                # Multi-word or long single words - safe to use substring matching
+                or any(keyword in text_lower for keyword in long_keywords)
+            ):
+                seen_ids.add(team.id)
                 found_teams.append(team)
-                continue
-            
-            # Check keywords
-            for keyword in team.keywords:
-                if len(keyword.split()) > 1 or len(keyword) > 4:
-                    # Multi-word or long single words - safe to use substring matching
-                    if keyword in text_lower:
-                        found_teams.append(team)
-                        break
-                else:
-                    # Short single words - use word boundaries to avoid false matches
-                    pattern = r'\b' + re.escape(keyword) + r'\b'
-                    if re.search(pattern, text_lower):
-                        found_teams.append(team)
-                        break
         
         return found_teams
     
+    @classmethod
+    def _get_text_matchers(cls, sport: str) -> Optional[Dict[str, Any]]:
+        """Get compiled text matchers for a sport, building them on first use."""
+        matchers = _TEXT_MATCHERS.get(sport)
+        if matchers is not None:
+            return matchers
+        
+        teams = cls._get_cached_teams(sport)
+        if not teams:
+            return None
+        
+        # Check longer names first
+        teams = sorted(teams, key=lambda team: len(team.canonical_name), reverse=True)
+        matchers = _build_text_matchers(teams)
+        _TEXT_MATCHERS[sport] = matchers
+        return matchers
+    
+    @classmethod
+    def _get_cached_teams(cls, sport: str) -> List['Team']:
+        """Get all teams for a sport, loading them from the database on first use."""
+        teams = _TEAMS.get(sport)
+        if teams is None:
+            teams = cls.get_all_teams(sport)
+            # Don't cache an empty result so teams added later are still picked up
+            if teams:
+                _TEAMS[sport] = teams
+        return teams
+    
+    @classmethod
+    def clear_cache(cls, sport: Optional[str] = None):
+        """Drop cached teams and the lookups built from them, for one sport or all sports."""
+        for cache in (_TEAMS, _TEXT_MATCHERS, _KEYWORD_INDEX, _CANONICAL_NAMES):
+            if sport is None:
+                cache.clear()
+            else:
+                cache.pop(sport, None)
+    
     @classmethod
     def get_team_by_id(cls, team_id: int) -> Optional['Team']:
         """Get team by ID."""
@@ -166,13 +211,74 @@ class Team:
         return f"Team(id={self.id}, canonical_name='{self.canonical_name}')"
 
 
+def _build_text_matchers(teams: List[Team]) -> Dict[str, Any]:
+    """Precompile the patterns used by Team.find_teams_in_text for a list of teams."""
+    abbreviation_to_team_ids: Dict[str, List[int]] = {}
+    short_keyword_to_team_ids: Dict[str, List[int]] = {}
+    long_keywords = []
+    
+    for team in teams:
+        if team.abbreviation:
+            abbreviation_to_team_ids.setdefault(team.abbreviation.lower(), []).append(team.id)
+        
+        team_long_keywords = []
+        for keyword in team.keywords or []:
+            if len(keyword.split()) > 1 or len(keyword) > 4:
+                team_long_keywords.append(keyword)
+            else:
+                # Short single words - use word boundaries to avoid false matches
+                short_keyword_to_team_ids.setdefault(keyword, []).append(team.id)
+        
+        long_keywords.append((team, team.canonical_name.lower(), team_long_keywords))
+    
+    return {
+        'teams': teams,
+        'abbreviation_re': _word_alternation(abbreviation_to_team_ids),
+        'abbreviation_to_team_ids': abbreviation_to_team_ids,
+        'short_keyword_re': _word_alternation(short_keyword_to_team_ids),
+        'short_keyword_to_team_ids': short_keyword_to_team_ids,
+        'long_keywords': long_keywords,
+    }
+
+
+def _word_alternation(words) -> Optional[Pattern]:
+    """Compile a word-bounded pattern matching any of the given words."""
+    if not words:
+        return None
+    # Longest first so a word is never shadowed by one of its prefixes
+    alternatives = sorted(words, key=len, reverse=True)
+    return re.compile(r'\b(' + '|'.join(re.escape(word) for word in alternatives) + r')\b')
+
+
+def _regex_hits(pattern: Optional[Pattern], word_to_team_ids: Dict[str, List[int]], text: str) -> Set[int]:
+    """Return the IDs of teams whose words the pattern finds in text."""
+    hits = set()
+    if pattern:
+        for word in pattern.findall(text):
+            hits.update(word_to_team_ids[word])
+    return hits
+
+
+def _fast_normalize(text: str) -> str:
+    """Lowercase and strip text, skipping the copy when it is already normalized."""
+    if text.isascii() and text.islower() and text == text.strip():
+        return text
+    return text.lower().strip()
+
+
 def normalize_team_name_for_matching(team_name: str, sport: str = 'mlb') -> Optional[str]:
     """
     Normalize team name for cross-platform matching using the database.
     Returns the canonical team name if found, None otherwise.
     """
-    team = Team.find_team_by_name(team_name, sport)
-    return team.canonical_name if team else None
+    canonical_names = _CANONICAL_NAMES.setdefault(sport, {})
+    canonical_name = canonical_names.get(team_name)
+    if canonical_name is None:
+        team = Team.find_team_by_name(team_name, sport)
+        if team is None:
+            return None
+        canonical_name = canonical_names[team_name] = team.canonical_name
+    return canonical_name
 
 
 def find_teams_in_text(text: str, sport: str = 'mlb') -> List[str]:
@@ -189,6 +295,12 @@ def teams_match_fuzzy(team1: str, team2: str, sport: str = 'mlb') -> bool:
     if not team1 or not team2:
         return False
     
+    # Identical names always match, no lookup needed
+    team1_lower = team1.lower().strip()
+    team2_lower = team2.lower().strip()
+    if team1_lower == team2_lower:
+        return True
+    
     # Find both teams in database
     team1_obj = Team.find_team_by_name(team1, sport)
     team2_obj = Team.find_team_by_name(team2, sport)
@@ -199,8 +311,8 @@ def teams_match_fuzzy(team1: str, team2: str, sport: str = 'mlb') -> bool:
     
     # If only one found, check if the other name matches any keywords of the found team
     if team1_obj:
-        return team2.lower().strip() in team1_obj.keywords
+        return team2_lower in team1_obj.keywords
     elif team2_obj:
-        return team1.lower().strip() in team2_obj.keywords
+        return team1_lower in team2_obj.keywords
     
     return False
\ No newline at end of file
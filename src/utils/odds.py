@@ -1,7 +1,12 @@
 """Odds conversion and de-vigging utilities."""
 
-from typing import List, Dict, Any
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Callable
 import math
+import numpy as np
+
+# Books whose implied probabilities sum to at most this are treated as fair
+FAIR_BOOK_TOLERANCE = 1.0001
 
 
 def american_to_decimal(american_odds: int) -> float:
@@ -47,23 +52,76 @@ def devig_odds(outcomes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     
     total_probability = sum(probabilities)
     
-    if total_probability <= 1:
+    if total_probability <= FAIR_BOOK_TOLERANCE:
         # No vig detected, return original probabilities
-        for i, outcome in enumerate(outcomes):
-            outcome['devigged_probability'] = probabilities[i]
-            outcome['devigged_decimal_odds'] = outcome['decimal_odds']
+        for outcome, probability in zip(outcomes, probabilities):
+            outcome.update(
+                devigged_probability=probability,
+                devigged_decimal_odds=outcome['decimal_odds']
+            )
         return outcomes
     
     # Find exponent k such that sum(p_i^k) = 1
-    # We solve this using binary search
-    def sum_powered_probs(k: float) -> float:
-        return sum(p ** k for p in probabilities)
+    if len(probabilities) == 2:
+        k = _find_exponent_two_way(*probabilities)
+    else:
+        k = _find_exponent(lambda k: sum(p ** k for p in probabilities))
     
-    # Binary search for the correct exponent
-    low, high = 0.0, 1.0
+    for outcome, probability in zip(outcomes, probabilities):
+        devigged_prob = probability ** k
+        outcome.update(
+            devigged_probability=devigged_prob,
+            devigged_decimal_odds=implied_probability_to_decimal(devigged_prob)
+        )
+    
+    return outcomes
+
+
+def _find_exponent_two_way(p1: float, p2: float) -> float:
+    """
+    Find exponent k such that p1^k + p2^k = 1 using Newton's method.
+    
+    Seeded at k = 1, a few steps are enough for realistic vig levels; falls
+    back to binary search if the iteration has not converged.
+    """
+    tolerance = 1e-10
+    log_p1, log_p2 = math.log(p1), math.log(p2)
+    
+    k = 1.0
+    for _ in range(4):
+        p1_k, p2_k = p1 ** k, p2 ** k
+        residual = p1_k + p2_k - 1.0
+        if abs(residual) < tolerance:
+            return k
+        slope = p1_k * log_p1 + p2_k * log_p2
+        if slope == 0:
+            break
+        k -= residual / slope
+    
+    if abs(p1 ** k + p2 ** k - 1.0) < tolerance:
+        return k
+    
+    return _find_exponent(lambda k: p1 ** k + p2 ** k)
+
+
+def _find_exponent(sum_powered_probs: Callable[[float], float]) -> float:
+    """
+    Find exponent k such that sum_powered_probs(k) = 1 using binary search.
+    
+    The sum of powered probabilities decreases as k grows and exceeds 1 at
+    k = 1 whenever the book has vig, so the root is bracketed above 1.
+    """
     tolerance = 1e-10
     max_iterations = 100
     
+    # Widen the upper bound until it brackets the root
+    low, high = 1.0, 2.0
+    for _ in range(max_iterations):
+        if sum_powered_probs(high) <= 1.0:
+            break
+        low, high = high, high * 2
+    
+    # Binary search for the correct exponent
     for _ in range(max_iterations):
         mid = (low + high) / 2
         sum_val = sum_powered_probs(mid)
@@ -75,11 +133,87 @@ def devig_odds(outcomes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         else:
             high = mid
     
-    k = mid
+    return mid
+
+
+@dataclass
+class OddsTable:
+    """
+    Column-oriented odds for many markets.
+    
+    Outcomes for all markets are stored back to back; the outcomes of market i
+    live in the slice market_offsets[i]:market_offsets[i + 1].
+    """
+    decimal_odds: np.ndarray
+    market_offsets: np.ndarray
+    devigged_probability: np.ndarray = field(default=None)
+    devigged_decimal_odds: np.ndarray = field(default=None)
     
-    for i, outcome in enumerate(outcomes):
-        devigged_prob = probabilities[i] ** k
-        outcome['devigged_probability'] = devigged_prob
-        outcome['devigged_decimal_odds'] = implied_probability_to_decimal(devigged_prob)
+    def __post_init__(self):
+        if self.devigged_probability is None:
+            self.devigged_probability = np.full(len(self.decimal_odds), np.nan)
+        if self.devigged_decimal_odds is None:
+            self.devigged_decimal_odds = np.full(len(self.decimal_odds), np.nan)
+    
+    @classmethod
+    def from_list_of_dicts(cls, markets: List[List[Dict[str, Any]]]) -> 'OddsTable':
+        """Build a table from per-market lists of outcome dictionaries."""
+        decimal_odds = np.asarray(
+            [outcome['decimal_odds'] for outcomes in markets for outcome in outcomes],
+            dtype=np.float64
+        )
+        # NumPy would turn None into NaN and 0 into inf; reject them like devig_odds does
+        if not np.all(np.isfinite(decimal_odds) & (decimal_odds > 0)):
+            raise ValueError(f"Invalid decimal odds: {decimal_odds.tolist()}")
+        
+        market_offsets = np.zeros(len(markets) + 1, dtype=np.int64)
+        np.cumsum([len(outcomes) for outcomes in markets], out=market_offsets[1:])
+        return cls(
+            decimal_odds=decimal_odds,
+            market_offsets=market_offsets
+        )
+    
+    def to_list_of_dicts(self, markets: List[List[Dict[str, Any]]]) -> List[List[Dict[str, Any]]]:
+        """Write de-vigged values back onto the outcome dictionaries the table was built from."""
+        devigged_probability = self.devigged_probability.tolist()
+        devigged_decimal_odds = self.devigged_decimal_odds.tolist()
+        
+        i = 0
+        for outcomes in markets:
+            for outcome in outcomes:
+                outcome['devigged_probability'] = devigged_probability[i]
+                outcome['devigged_decimal_odds'] = devigged_decimal_odds[i]
+                i += 1
+        
+        return markets
+
+
+def devig_odds_soa(table: OddsTable) -> OddsTable:
+    """
+    De-vig every market in an OddsTable using the constant exponent method.
+    
+    Fills the table's 'devigged_probability' and 'devigged_decimal_odds'
+    arrays in place and returns the table.
+    """
+    probabilities = 1.0 / table.decimal_odds
+    offsets = table.market_offsets
+    
+    for start, end in zip(offsets[:-1], offsets[1:]):
+        market_probs = probabilities[start:end]
+        
+        if market_probs.sum() <= FAIR_BOOK_TOLERANCE:
+            # No vig detected, keep original probabilities
+            table.devigged_probability[start:end] = market_probs
+            table.devigged_decimal_odds[start:end] = table.decimal_odds[start:end]
+            continue
+        
+        if end - start == 2:
+            k = _find_exponent_two_way(float(market_probs[0]), float(market_probs[1]))
+        else:
+            k = _find_exponent(lambda k: float(np.power(market_probs, k).sum()))
+        
+        devigged_probs = np.power(market_probs, k)
+        table.devigged_probability[start:end] = devigged_probs
+        table.devigged_decimal_odds[start:end] = 1.0 / devigged_probs
     
-    return outcomes
\ No newline at end of file
+    return table
@@ -1,26 +1,88 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date
 import sys
 import os
+import math
+import warnings
 
-# Add the src directory to the path so we can import our modules
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+# Add the src directory to the path so we can import our modules;
+# Streamlit re-executes this script on every rerun, so only add it once
+src_path = os.path.join(os.path.dirname(__file__), 'src')
+if src_path not in sys.path:
+    sys.path.append(src_path)
 
 from config.database import db_manager
 
+# pandas warns about DBAPI connections other than sqlite3; psycopg2 works fine.
+# Set once here, since catch_warnings() is not thread-safe across sessions
+warnings.filterwarnings('ignore', message='pandas only supports SQLAlchemy', category=UserWarning)
+
+# Display labels for stored game outcomes
+_OUTCOME_LABEL = {
+    'home_win': 'Home Win',
+    'away_win': 'Away Win',
+    'draw': 'Draw',
+    'home_team_won': 'Home Team Won',
+    'away_team_won': 'Away Team Won',
+}
+
 st.set_page_config(
     page_title="Odds Analysis Dashboard",
     page_icon="📊",
     layout="wide"
 )
 
-@st.cache_data(ttl=60)  # Cache for 60 seconds
-def load_games():
-    """Load all games from the database"""
+@st.cache_resource
+def _session_timezone():
+    """Get the database session time zone that timestamps are displayed in"""
+    return db_manager.execute_query("SHOW TIME ZONE")[0][0]
+
+def read_sql(query, params=None, **kwargs):
+    """Run a query on a pooled connection and return the result as a DataFrame"""
+    conn = db_manager.get_connection()
+    try:
+        df = pd.read_sql_query(query, conn, params=params, **kwargs)
+        conn.commit()
+        
+        # parse_dates converts TIMESTAMPTZ columns to UTC; show them in the session time zone
+        # as psycopg2 returns them
+        for col in df.select_dtypes('datetimetz').columns:
+            df[col] = df[col].dt.tz_convert(_session_timezone())
+        return df
+    except Exception as e:
+        conn.rollback()
+        raise e
+    finally:
+        db_manager.return_connection(conn)
+
+@st.cache_data(ttl=60, show_spinner=False)  # Cache for 60 seconds
+def load_game_dates():
+    """Load the distinct local dates that have games"""
     query = """
+    SELECT DISTINCT g.game_date_local
+    FROM games g
+    LEFT JOIN markets m ON g.id = m.game_id 
+    LEFT JOIN platforms p ON m.platform_id = p.id 
+    WHERE p.name = 'polymarket' OR p.name IS NULL
+    ORDER BY g.game_date_local
+    """
+    
+    try:
+        results = db_manager.execute_query(query)
+        return [row[0] for row in results] if results else []
+    except Exception as e:
+        st.error(f"Error loading game dates: {e}")
+        return []
+
+@st.cache_data(ttl=60, show_spinner=False)  # Cache for 60 seconds
+def load_games(game_date=None):
+    """Load games from the database, optionally only those on a given local date"""
+    date_filter = "AND g.game_date_local = %s" if game_date is not None else ""
+    query = f"""
     SELECT 
         g.id,
         g.sport,
@@ -35,21 +97,25 @@ def load_games():
     FROM games g
     LEFT JOIN markets m ON g.id = m.game_id 
     LEFT JOIN platforms p ON m.platform_id = p.id 
-    WHERE p.name = 'polymarket' OR p.name IS NULL
+    WHERE (p.name = 'polymarket' OR p.name IS NULL)
+    {date_filter}
     ORDER BY g.game_start_time DESC
     """
+    params = (game_date,) if game_date is not None else None
     
     try:
-        results = db_manager.execute_query(query)
-        if results:
-            columns = ['id', 'sport', 'league', 'home_team', 'away_team', 'game_date_local', 'game_start_time', 'actual_outcome', 'game_status', 'polymarket_slug']
-            return pd.DataFrame(results, columns=columns)
-        else:
-            return pd.DataFrame()
+        # Few distinct values repeated across rows - store as categories
+        return read_sql(
+            query,
+            params,
+            parse_dates=['game_date_local', 'game_start_time'],
+            dtype={col: 'category' for col in ('sport', 'league', 'home_team', 'away_team', 'game_status')}
+        )
     except Exception as e:
         st.error(f"Error loading games: {e}")
         return pd.DataFrame()
 
+@st.cache_data(ttl=300)  # Completed-game stats change slowly
 def calculate_brier_scores():
     """Calculate Brier scores for each platform using completed games."""
     query = """
@@ -63,8 +129,8 @@ def calculate_brier_scores():
             CASE 
                 WHEN g.actual_outcome = o.outcome_type THEN 1.0 
                 ELSE 0.0 
-            END, 2)) as brier_score,
-        AVG(os.devigged_probability) as avg_predicted_probability
+            END, 2))::double precision as brier_score,
+        AVG(os.devigged_probability)::double precision as avg_predicted_probability
     FROM odds_snapshots os
     JOIN outcomes o ON os.outcome_id = o.id
     JOIN markets m ON o.market_id = m.id
@@ -80,84 +146,306 @@ def calculate_brier_scores():
     """
     
     try:
-        results = db_manager.execute_query(query)
-        if results:
-            columns = ['platform_name', 'platform_type', 'region', 'num_games', 'num_predictions', 
-                      'brier_score', 'avg_predicted_probability']
-            df = pd.DataFrame(results, columns=columns)
-            
-            # Convert decimal columns to float
-            numeric_columns = ['brier_score', 'avg_predicted_probability']
-            for col in numeric_columns:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            return df
-        else:
-            return pd.DataFrame()
+        return read_sql(query, dtype={'platform_type': 'category'})
     except Exception as e:
         st.error(f"Error calculating Brier scores: {e}")
         return pd.DataFrame()
 
-@st.cache_data(ttl=60)  # Cache for 60 seconds
-def load_odds_for_game(game_id):
-    """Load all odds data for a specific game"""
-    query = """
+# SQL select expressions for the odds columns the dashboard can load
+ODDS_COLUMN_SQL = {
+    # Epoch seconds convert to datetime64 in one vectorized pass, unlike datetime objects
+    'timestamp': 'EXTRACT(EPOCH FROM os.timestamp)::double precision as timestamp',
+    'platform_name': 'p.name as platform_name',
+    'outcome_type': 'o.outcome_type',
+    'decimal_odds': 'os.decimal_odds::double precision as decimal_odds',
+    'devigged_decimal_odds': 'os.devigged_decimal_odds::double precision as devigged_decimal_odds',
+    'raw_probability': 'os.raw_probability::double precision as raw_probability',
+    'devigged_probability': 'os.devigged_probability::double precision as devigged_probability',
+    'is_closing_line': 'os.is_closing_line',
+}
+
+# The odds table shows rounded values; round them in the database
+ODDS_TABLE_COLUMN_SQL = {
+    **ODDS_COLUMN_SQL,
+    'decimal_odds': 'ROUND(os.decimal_odds, 3)::double precision as decimal_odds',
+    'devigged_decimal_odds': 'ROUND(os.devigged_decimal_odds, 3)::double precision as devigged_decimal_odds',
+    'raw_probability': 'ROUND(os.raw_probability, 4)::double precision as raw_probability',
+    'devigged_probability': 'ROUND(os.devigged_probability, 4)::double precision as devigged_probability',
+}
+
+ODDS_CHART_COLUMNS = ['timestamp', 'platform_name', 'outcome_type', 'decimal_odds',
+                      'devigged_decimal_odds', 'raw_probability', 'devigged_probability']
+ODDS_TABLE_COLUMNS = ODDS_CHART_COLUMNS + ['is_closing_line']
+# Rows fetched per page of the odds table
+ODDS_TABLE_PAGE_SIZE = 200
+
+# Below this many points SVG traces render faster than WebGL ones
+SCATTERGL_MIN_ROWS = 1000
+# Marker symbols used to tell platforms apart in the time series chart
+MARKER_SYMBOLS = ['circle', 'square', 'diamond', 'triangle-up', 'x', 'cross', 'star', 'triangle-down']
+# Points kept per outcome/platform series when downsampling the chart
+CHART_MAX_POINTS = 2000
+
+def _odds_filter(game_id, platform=None, outcome_type=None, closing_only=False):
+    """Build the WHERE clause and params selecting a game's odds matching the given filters"""
+    conditions = ["m.game_id = %s"]
+    # Convert numpy int64 to regular Python int
+    params = [int(game_id)]
+    
+    if platform is not None:
+        conditions.append("p.name = %s")
+        params.append(platform)
+    
+    if outcome_type is not None:
+        conditions.append("o.outcome_type = %s")
+        params.append(outcome_type)
+    
+    if closing_only:
+        conditions.append("os.is_closing_line = TRUE")
+    
+    return '\n    AND '.join(conditions), params
+
+def _load_odds(game_id, columns, platform=None, outcome_type=None, closing_only=False,
+               column_sql=ODDS_COLUMN_SQL, limit=None, offset=0):
+    """Load the given odds columns for a specific game, optionally filtered and paged in the database"""
+    select_list = ',\n        '.join(column_sql[col] for col in columns)
+    where_clause, params = _odds_filter(game_id, platform, outcome_type, closing_only)
+    
+    page_clause = ""
+    if limit is not None:
+        page_clause = "LIMIT %s OFFSET %s"
+        params += [int(limit), int(offset)]
+    
+    query = f"""
     SELECT 
-        os.timestamp,
-        p.name as platform_name,
-        p.platform_type,
-        p.region,
-        m.market_name,
-        o.outcome_type,
-        o.outcome_name,
-        os.decimal_odds,
-        os.raw_probability,
-        os.devigged_probability,
-        os.devigged_decimal_odds,
-        os.is_closing_line
-    FROM odds_snapshots os
-    JOIN outcomes o ON os.outcome_id = o.id
-    JOIN markets m ON o.market_id = m.id
+        {select_list}
+    FROM markets m
     JOIN platforms p ON m.platform_id = p.id
-    JOIN games g ON m.game_id = g.id
-    WHERE g.id = %s
-    ORDER BY os.timestamp, p.name, o.outcome_type
+    JOIN outcomes o ON o.market_id = m.id
+    JOIN odds_snapshots os ON os.outcome_id = o.id
+    WHERE {where_clause}
+    ORDER BY os.timestamp, p.name, o.outcome_type, os.id
+    {page_clause}
     """
     
     try:
-        # Convert numpy int64 to regular Python int
-        game_id_param = int(game_id)
-        results = db_manager.execute_query(query, (game_id_param,))
-        if results:
-            columns = ['timestamp', 'platform_name', 'platform_type', 'region', 'market_name', 
-                      'outcome_type', 'outcome_name', 'decimal_odds', 'raw_probability', 
-                      'devigged_probability', 'devigged_decimal_odds', 'is_closing_line']
-            df = pd.DataFrame(results, columns=columns)
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            
-            # Convert decimal columns to float for compatibility with Plotly
-            decimal_columns = ['decimal_odds', 'raw_probability', 'devigged_probability', 'devigged_decimal_odds']
-            for col in decimal_columns:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            return df
-        else:
-            return pd.DataFrame()
+        # Few distinct values repeated across rows - store as categories
+        return read_sql(
+            query,
+            tuple(params),
+            parse_dates={'timestamp': {'unit': 's', 'utc': True}},
+            dtype={'platform_name': 'category', 'outcome_type': 'category'}
+        )
     except Exception as e:
         st.error(f"Error loading odds data: {e}")
         return pd.DataFrame()
 
+@st.cache_data(ttl=30)  # Cache for 30 seconds
+def load_odds_chart(game_id):
+    """Load the odds columns used by the time series chart for a specific game"""
+    return _load_odds(game_id, ODDS_CHART_COLUMNS)
+
+@st.cache_data(ttl=30)  # Cache for 30 seconds
+def load_odds_table(game_id, platform=None, outcome_type=None, closing_only=False,
+                    limit=ODDS_TABLE_PAGE_SIZE, offset=0):
+    """Load one page of odds table rows for a specific game matching the selected filters"""
+    return _load_odds(game_id, ODDS_TABLE_COLUMNS, platform, outcome_type, closing_only,
+                      column_sql=ODDS_TABLE_COLUMN_SQL, limit=limit, offset=offset)
+
+@st.cache_data(ttl=30)  # Cache for 30 seconds
+def count_odds_table(game_id, platform=None, outcome_type=None, closing_only=False):
+    """Count the odds table rows for a specific game matching the selected filters"""
+    where_clause, params = _odds_filter(game_id, platform, outcome_type, closing_only)
+    query = f"""
+    SELECT COUNT(*)
+    FROM markets m
+    JOIN platforms p ON m.platform_id = p.id
+    JOIN outcomes o ON o.market_id = m.id
+    JOIN odds_snapshots os ON os.outcome_id = o.id
+    WHERE {where_clause}
+    """
+    
+    try:
+        results = db_manager.execute_query(query, tuple(params))
+        return results[0][0] if results else 0
+    except Exception as e:
+        st.error(f"Error counting odds data: {e}")
+        return 0
+
+@st.cache_data(ttl=30)  # Cache for 30 seconds
+def load_filter_options(game_id):
+    """Load the platform names and outcome types with odds for a specific game"""
+    # EXISTS stops at the first snapshot of each outcome (via the outcome index)
+    # instead of joining and de-duplicating every snapshot for the game
+    query = """
+    WITH outcomes_with_odds AS (
+        SELECT p.name AS platform, o.outcome_type
+        FROM markets m
+        JOIN platforms p ON m.platform_id = p.id
+        JOIN outcomes o ON o.market_id = m.id
+        WHERE m.game_id = %s
+        AND EXISTS (SELECT 1 FROM odds_snapshots os WHERE os.outcome_id = o.id)
+    )
+    SELECT 
+        ARRAY(SELECT DISTINCT platform FROM outcomes_with_odds ORDER BY platform),
+        ARRAY(SELECT DISTINCT outcome_type FROM outcomes_with_odds ORDER BY outcome_type)
+    """
+    
+    try:
+        results = db_manager.execute_query(query, (int(game_id),))
+        if not results:
+            return [], []
+        platforms, outcomes = results[0]
+        return platforms, outcomes
+    except Exception as e:
+        st.error(f"Error loading filter options: {e}")
+        return [], []
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _make_display_names(games_df):
+    """Build the "Away @ Home (HH:MM)" label for each game"""
+    start_times = games_df['game_start_time'].dt.strftime('%H:%M').to_numpy()
+    return [
+        f"{away} @ {home} ({start})"
+        for away, home, start in zip(
+            games_df['away_team'].to_numpy(),
+            games_df['home_team'].to_numpy(),
+            start_times
+        )
+    ]
+
+@st.cache_data
+def _palettes(outcomes, platforms):
+    """Map each outcome to a chart color and each platform to a marker symbol"""
+    colors = px.colors.qualitative.Plotly
+    outcome_colors = {outcome: colors[i % len(colors)] for i, outcome in enumerate(outcomes)}
+    platform_symbols = {platform: MARKER_SYMBOLS[i % len(MARKER_SYMBOLS)] for i, platform in enumerate(platforms)}
+    return outcome_colors, platform_symbols
+
+def _lttb(x, y, n_out):
+    """Pick the indices of n_out points that preserve the shape of a series (Largest-Triangle-Three-Buckets)"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    # First and last points are always kept; the rest are split into n_out - 2 buckets
+    every = (n - 2) / (n_out - 2)
+    edges = np.append((np.arange(n_out - 1) * every).astype(np.int64) + 1, n)
+    edges[-2] = n - 1
+    
+    sampled = np.empty(n_out, dtype=np.int64)
+    sampled[0] = 0
+    sampled[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2]
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        
+        # Keep the point forming the largest triangle with the last kept point and the next bucket's average
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) -
+            (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        sampled[i + 1] = a
+    
+    return sampled
+
+def _downsample_chart_data(chart_data, odds_type, n_out=CHART_MAX_POINTS):
+    """Downsample each outcome/platform series of the chart data to at most n_out points"""
+    keep = []
+    for _, group in chart_data.groupby(['outcome_type', 'platform_name'], observed=True):
+        group = group[group[odds_type].notna()]
+        if len(group) <= n_out:
+            keep.append(group.index.to_numpy())
+            continue
+        
+        x = group['timestamp'].astype('int64').to_numpy(dtype=np.float64)
+        y = group[odds_type].to_numpy(dtype=np.float64)
+        keep.append(group.index.to_numpy()[_lttb(x, y, n_out)])
+    
+    if not keep:
+        return chart_data.iloc[:0]
+    return chart_data.loc[np.concatenate(keep)]
+
+@st.cache_data(ttl=30)  # Cache for 30 seconds
+def load_chart_data(game_id, outcomes, odds_type):
+    """Load the chart points for the given outcomes of a game, downsampled for plotting"""
+    chart_odds_df = load_odds_chart(game_id)
+    chart_data = chart_odds_df[chart_odds_df['outcome_type'].isin(outcomes)]
+    
+    # Send at most CHART_MAX_POINTS points per series to the browser
+    return _downsample_chart_data(chart_data, odds_type)
+
+@st.cache_data(ttl=30)  # Cache for 30 seconds
+def _summary_stats(game_id, selected_outcomes, odds_type):
+    """Summarize one odds column by outcome and platform for the selected outcomes of a game"""
+    odds_df = load_odds_chart(game_id)
+    if odds_df.empty:
+        return pd.DataFrame()
+    
+    outcomes = odds_df['outcome_type'].cat
+    platforms = odds_df['platform_name'].cat
+    values = odds_df[odds_type].to_numpy(dtype=np.float64)
+    
+    # One integer key per (outcome, platform) pair, skipping missing values like groupby does
+    keys = outcomes.codes.to_numpy(dtype=np.int64) * len(platforms.categories) + platforms.codes.to_numpy()
+    valid = ~np.isnan(values) & odds_df['outcome_type'].isin(selected_outcomes).to_numpy()
+    keys, values = keys[valid], values[valid]
+    
+    # Accumulate count, sum, sum of squares, min and max for every group in a single pass
+    n_groups = len(outcomes.categories) * len(platforms.categories)
+    count = np.bincount(keys, minlength=n_groups)
+    total = np.bincount(keys, weights=values, minlength=n_groups)
+    sum_sq = np.bincount(keys, weights=values * values, minlength=n_groups)
+    mins = np.full(n_groups, np.inf)
+    maxs = np.full(n_groups, -np.inf)
+    np.minimum.at(mins, keys, values)
+    np.maximum.at(maxs, keys, values)
+    
+    # Keep only the (outcome, platform) pairs that have data
+    group_keys = np.flatnonzero(count)
+    count, total, sum_sq = count[group_keys], total[group_keys], sum_sq[group_keys]
+    mean = total / count
+    # Sample standard deviation (ddof=1), undefined for single-value groups
+    sum_sq_dev = np.maximum(sum_sq - total * mean, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        std = np.where(count > 1, np.sqrt(sum_sq_dev / (count - 1)), np.nan)
+    
+    index = pd.MultiIndex.from_arrays(
+        [outcomes.categories[group_keys // len(platforms.categories)],
+         platforms.categories[group_keys % len(platforms.categories)]],
+        names=['outcome_type', 'platform_name']
+    )
+    summary_stats = pd.DataFrame({
+        'Min': mins[group_keys],
+        'Max': maxs[group_keys],
+        'Mean': mean,
+        'Std Dev': std,
+        'Count': count,
+    }, index=index)
+    
+    return summary_stats.round(3)
+
 def main():
     st.title("📊 Sports Odds Analysis Dashboard")
     st.markdown("---")
     
     # Main navigation
-    page = st.selectbox(
-        "Select a page:",
-        ["Game Analysis", "Brier Scores"]
-    )
+    nav_col, refresh_col = st.columns([4, 1])
+    
+    with nav_col:
+        page = st.selectbox(
+            "Select a page:",
+            ["Game Analysis", "Brier Scores"]
+        )
+    
+    with refresh_col:
+        # Cached query results otherwise expire on their TTL
+        if st.button("🔄 Refresh data"):
+            st.cache_data.clear()
     
     if page == "Game Analysis":
         show_game_analysis()
@@ -194,7 +482,7 @@ def show_brier_scores():
     # Filters
     col1, col2 = st.columns(2)
     with col1:
-        platform_types = ['All'] + sorted(brier_df['platform_type'].unique().tolist())
+        platform_types = ['All'] + list(brier_df['platform_type'].cat.categories)
         selected_type = st.selectbox("Platform Type", platform_types)
     
     with col2:
@@ -203,12 +491,12 @@ def show_brier_scores():
                                    max_value=int(brier_df['num_predictions'].max()), 
                                    value=50)
     
-    # Filter data
-    filtered_df = brier_df.copy()
+    # Filter data with a single combined mask
+    mask = brier_df['num_predictions'].to_numpy() >= min_predictions
     if selected_type != 'All':
-        filtered_df = filtered_df[filtered_df['platform_type'] == selected_type]
+        mask &= (brier_df['platform_type'] == selected_type).to_numpy()
     
-    filtered_df = filtered_df[filtered_df['num_predictions'] >= min_predictions]
+    filtered_df = brier_df.loc[mask]
     
     if filtered_df.empty:
         st.warning("No platforms match the selected filters.")
@@ -221,8 +509,7 @@ def show_brier_scores():
     display_df['region'] = display_df['region'].fillna('Global')
     
     # Format columns for display
-    display_df['brier_score'] = display_df['brier_score'].round(4)
-    display_df['avg_predicted_probability'] = display_df['avg_predicted_probability'].round(3)
+    display_df = display_df.round({'brier_score': 4, 'avg_predicted_probability': 3})
     
     st.dataframe(
         display_df,
@@ -279,46 +566,41 @@ def show_brier_scores():
     with col1:
         st.markdown("**Best Performers:**")
         top_3 = filtered_df.nsmallest(3, 'brier_score')
-        for i, row in top_3.iterrows():
-            region_text = f" ({row['region']})" if pd.notna(row['region']) and row['region'] != 'Global' else ""
-            st.write(f"{row.name + 1}. {row['platform_name']}{region_text}: {row['brier_score']:.4f}")
+        for rank, row in enumerate(top_3.itertuples(index=False), start=1):
+            region_text = f" ({row.region})" if pd.notna(row.region) and row.region != 'Global' else ""
+            st.write(f"{rank}. {row.platform_name}{region_text}: {row.brier_score:.4f}")
     
     with col2:
         st.markdown("**Most Active:**")
         most_active = filtered_df.nlargest(3, 'num_predictions')
-        for i, row in most_active.iterrows():
-            region_text = f" ({row['region']})" if pd.notna(row['region']) and row['region'] != 'Global' else ""
-            st.write(f"{row.name + 1}. {row['platform_name']}{region_text}: {row['num_predictions']:,} predictions")
+        for rank, row in enumerate(most_active.itertuples(index=False), start=1):
+            region_text = f" ({row.region})" if pd.notna(row.region) and row.region != 'Global' else ""
+            st.write(f"{rank}. {row.platform_name}{region_text}: {row.num_predictions:,} predictions")
 
 def show_game_analysis():
     """Display the original game analysis page."""
-    # Load games
-    games_df = load_games()
+    # Load the dates that have games
+    game_dates = load_game_dates()
     
-    if games_df.empty:
+    if not game_dates:
         st.warning("No games found in the database.")
         return
     
     # Game selection
     st.subheader("Select a Game")
     
-    # Convert game_date to datetime for date filtering
-    games_df['game_date_local'] = pd.to_datetime(games_df['game_date_local'])
-    
     # Date picker for filtering games
     col1, col2 = st.columns([1, 2])
     
     with col1:
         # Get available date range
-        min_date = games_df['game_date_local'].min().date()
-        max_date = games_df['game_date_local'].max().date()
+        min_date = game_dates[0]
+        max_date = game_dates[-1]
         
         # Default to today's date if there are games today, otherwise most recent date
-        from datetime import date
         today = date.today()
-        available_dates = set(games_df['game_date_local'].dt.date)
         
-        if today in available_dates:
+        if today in set(game_dates):
             default_date = today
         else:
             default_date = max_date
@@ -331,8 +613,8 @@ def show_game_analysis():
             key="date_selector"
         )
     
-    # Filter games by selected date
-    games_on_date = games_df[games_df['game_date_local'].dt.date == selected_date].copy()
+    # Load only the games on the selected date
+    games_on_date = load_games(selected_date)
     
     if games_on_date.empty:
         st.warning(f"No games found for {selected_date}")
@@ -342,10 +624,7 @@ def show_game_analysis():
     games_on_date = games_on_date.sort_values('game_start_time')
     
     # Create display names for games on selected date
-    games_on_date['display_name'] = (
-        games_on_date['away_team'] + ' @ ' + games_on_date['home_team'] + 
-        ' (' + games_on_date['game_start_time'].dt.strftime('%H:%M') + ')'
-    )
+    games_on_date['display_name'] = _make_display_names(games_on_date)
     
     with col2:
         # Game selection dropdown for the selected date
@@ -364,17 +643,6 @@ def show_game_analysis():
     if pd.notna(selected_game['polymarket_slug']) and selected_game['polymarket_slug']:
         st.markdown(f"🔗 [View on Polymarket](https://polymarket.com/event/{selected_game['polymarket_slug']})")
     
-    # Store the current game ID in session state to track changes
-    if 'current_game_id' not in st.session_state:
-        st.session_state.current_game_id = game_id
-    elif st.session_state.current_game_id != game_id:
-        st.session_state.current_game_id = game_id
-        # Clear any cached multiselect state when game changes
-        if hasattr(st.session_state, 'outcomes_selector_keys'):
-            for key in st.session_state.outcomes_selector_keys:
-                if key in st.session_state:
-                    del st.session_state[key]
-    
     # Display game info
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -383,16 +651,16 @@ def show_game_analysis():
         st.metric("Status", selected_game['game_status'].title())
     with col3:
         if pd.notna(selected_game['actual_outcome']):
-            st.metric("Outcome", selected_game['actual_outcome'].replace('_', ' ').title())
+            st.metric("Outcome", _OUTCOME_LABEL.get(selected_game['actual_outcome'], selected_game['actual_outcome']))
         else:
             st.metric("Outcome", "TBD")
     
     st.markdown("---")
     
-    # Load odds data for selected game
-    odds_df = load_odds_for_game(game_id)
+    # Load the filter options for the selected game; the odds themselves load per view
+    odds_platforms, odds_outcomes = load_filter_options(game_id)
     
-    if odds_df.empty:
+    if not odds_platforms:
         st.warning("No odds data found for this game.")
         return
     
@@ -406,39 +674,40 @@ def show_game_analysis():
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            platforms = ['All'] + sorted(odds_df['platform_name'].unique().tolist())
+            platforms = ['All'] + odds_platforms
             selected_platform = st.selectbox("Platform", platforms)
         
         with col2:
-            outcomes = ['All'] + sorted(odds_df['outcome_type'].unique().tolist())
+            outcomes = ['All'] + odds_outcomes
             selected_outcome = st.selectbox("Outcome", outcomes)
         
         with col3:
             show_closing_only = st.checkbox("Show closing lines only")
         
-        # Filter the data
-        filtered_df = odds_df.copy()
-        
-        if selected_platform != 'All':
-            filtered_df = filtered_df[filtered_df['platform_name'] == selected_platform]
-        
-        if selected_outcome != 'All':
-            filtered_df = filtered_df[filtered_df['outcome_type'] == selected_outcome]
-        
-        if show_closing_only:
-            filtered_df = filtered_df[filtered_df['is_closing_line'] == True]
+        # Filter and page the data in the database so only the visible rows are transferred
+        table_filters = dict(
+            platform=None if selected_platform == 'All' else selected_platform,
+            outcome_type=None if selected_outcome == 'All' else selected_outcome,
+            closing_only=show_closing_only
+        )
+        total_rows = count_odds_table(game_id, **table_filters)
         
         # Display the table
-        if not filtered_df.empty:
-            # Format the display DataFrame
-            display_df = filtered_df[['timestamp', 'platform_name', 'outcome_type', 'decimal_odds', 
-                                    'devigged_decimal_odds', 'raw_probability', 'devigged_probability', 
-                                    'is_closing_line']].copy()
+        if total_rows > 0:
+            max_pages = math.ceil(total_rows / ODDS_TABLE_PAGE_SIZE)
+            page = st.number_input(
+                f"Page (of {max_pages})",
+                min_value=1,
+                max_value=max_pages,
+                value=1,
+                step=1,
+                # Start from the first page whenever the game or filters change
+                key=f"odds_page_{game_id}_{selected_platform}_{selected_outcome}_{show_closing_only}"
+            )
+            offset = (page - 1) * ODDS_TABLE_PAGE_SIZE
             
-            display_df['raw_probability'] = display_df['raw_probability'].round(4)
-            display_df['devigged_probability'] = display_df['devigged_probability'].round(4)
-            display_df['decimal_odds'] = display_df['decimal_odds'].round(3)
-            display_df['devigged_decimal_odds'] = display_df['devigged_decimal_odds'].round(3)
+            # Values arrive already rounded from the database
+            display_df = load_odds_table(game_id, **table_filters, offset=offset)
             
             st.dataframe(
                 display_df,
@@ -456,99 +725,146 @@ def show_game_analysis():
                 }
             )
             
-            st.info(f"Showing {len(display_df)} odds entries")
+            st.info(f"Showing entries {offset + 1}-{offset + len(display_df)} of {total_rows} odds entries")
         else:
             st.warning("No data matches the selected filters.")
     
     with tab2:
-        st.subheader("Odds Over Time")
+        render_chart_tab(game_id, selected_game)
+
+def render_chart_tab(game_id, selected_game):
+    """Display the odds time series chart and summary statistics for a game"""
+    st.subheader("Odds Over Time")
+    
+    chart_odds_df = load_odds_chart(game_id)
+    
+    if not chart_odds_df.empty:
+        # Chart controls
+        col1, col2 = st.columns(2)
         
-        if not odds_df.empty:
-            # Chart controls
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                chart_outcomes = st.multiselect(
-                    "Select outcomes to display",
-                    options=sorted(odds_df['outcome_type'].unique()),
-                    default=sorted(odds_df['outcome_type'].unique()),
-                    key=f"outcomes_selector_{st.session_state.current_game_id}"
-                )
+        with col1:
+            chart_outcomes = st.multiselect(
+                "Select outcomes to display",
+                options=list(chart_odds_df['outcome_type'].cat.categories),
+                default=list(chart_odds_df['outcome_type'].cat.categories),
+                key=f"outcomes_selector_{game_id}"
+            )
+        
+        with col2:
+            odds_type = st.selectbox(
+                "Odds type",
+                options=['decimal_odds', 'devigged_decimal_odds'],
+                format_func=lambda x: "Raw Decimal Odds" if x == 'decimal_odds' else "De-vigged Decimal Odds",
+                index=1  # Default to 'De-vigged Decimal Odds'
+            )
+        
+        if chart_outcomes:
+            # Filtered, downsampled chart data is cached per selection
+            chart_data = load_chart_data(game_id, tuple(sorted(chart_outcomes)), odds_type)
             
-            with col2:
-                odds_type = st.selectbox(
-                    "Odds type",
-                    options=['decimal_odds', 'devigged_decimal_odds'],
-                    format_func=lambda x: "Raw Decimal Odds" if x == 'decimal_odds' else "De-vigged Decimal Odds",
-                    index=1  # Default to 'De-vigged Decimal Odds'
-                )
+            # Build one trace per outcome with platforms told apart by marker symbol;
+            # WebGL only pays off for larger histories
+            trace_type = go.Scatter if len(chart_data) < SCATTERGL_MIN_ROWS else go.Scattergl
+            # Pin colors/symbols to the game's full outcome and platform sets so they
+            # stay the same whichever outcomes are selected
+            platforms = chart_data['platform_name'].cat.categories
+            outcome_colors, platform_symbol_map = _palettes(
+                tuple(chart_odds_df['outcome_type'].cat.categories), tuple(platforms)
+            )
+            platform_symbols = np.array([platform_symbol_map[p] for p in platforms], dtype=object)
             
-            if chart_outcomes:
-                # Filter data for chart
-                chart_data = odds_df[odds_df['outcome_type'].isin(chart_outcomes)].copy()
+            fig = go.Figure()
+            for outcome, group in chart_data.groupby('outcome_type', observed=True):
+                # Group each platform's points together, keeping them in time order
+                codes = group['platform_name'].cat.codes.to_numpy()
+                order = np.argsort(codes, kind='stable')
+                codes = codes[order]
                 
-                # Ensure timestamp is properly formatted
-                chart_data['timestamp'] = pd.to_datetime(chart_data['timestamp'])
-                
-                # Create the line chart
-                fig = px.line(
-                    chart_data,
-                    x='timestamp',
-                    y=odds_type,
-                    color='outcome_type',
-                    line_dash='platform_name',
-                    hover_data=['platform_name', 'raw_probability', 'devigged_probability'],
-                    title=f"{'Raw' if odds_type == 'decimal_odds' else 'De-vigged'} Decimal Odds Over Time",
-                    labels={
-                        'timestamp': 'Time',
-                        odds_type: 'Decimal Odds',
-                        'outcome_type': 'Outcome'
-                    }
+                # Break the line between platforms so segments aren't joined up
+                breaks = np.flatnonzero(np.diff(codes)) + 1
+                # Milliseconds since epoch and 4-decimal odds serialize to short JSON numbers;
+                # plotly reads numeric dates as UTC, so encode the local wall-clock time
+                x_ms = group['timestamp'].dt.tz_localize(None).astype('int64').to_numpy() // 1_000_000
+                y_rounded = np.round(group[odds_type].to_numpy(dtype=np.float64), 4)
+                x = np.insert(x_ms[order].astype(object), breaks, None)
+                y = np.insert(y_rounded[order].astype(object), breaks, None)
+                symbols = np.insert(platform_symbols[codes], breaks, MARKER_SYMBOLS[0])
+                customdata = np.insert(
+                    group[['platform_name', 'raw_probability', 'devigged_probability']].to_numpy(dtype=object)[order],
+                    breaks, None, axis=0
                 )
                 
-                # Add markers to the lines
-                fig.update_traces(mode='lines+markers')
-                
-                # Add game start time line if we have the data
-                try:
-                    game_start_time = pd.to_datetime(selected_game['game_start_time'])
-                    # Convert to datetime object that Plotly can handle using .item() instead of deprecated .to_pydatetime()
-                    if hasattr(game_start_time, 'item'):
-                        game_start_dt = game_start_time.item()
-                    else:
-                        game_start_dt = game_start_time
-                    fig.add_vline(
-                        x=game_start_dt,
-                        line_dash="dash",
-                        line_color="red",
-                        annotation_text="Game Start"
+                fig.add_trace(trace_type(
+                    x=x.tolist(),
+                    y=y.tolist(),
+                    # Markers carry the platform symbol. Lines-only was chosen when every snapshot
+                    # got a marker; LTTB now caps each series at CHART_MAX_POINTS, which bounds them
+                    mode='lines+markers',
+                    name=outcome,
+                    legendgroup='outcomes',
+                    legendgrouptitle_text='Outcome',
+                    line=dict(color=outcome_colors[outcome], width=1),
+                    marker=dict(color=outcome_colors[outcome], symbol=symbols.tolist(), size=5),
+                    connectgaps=False,
+                    customdata=customdata.tolist(),
+                    hovertemplate=(
+                        f"Outcome: {outcome}<br>Platform: %{{customdata[0]}}<br>"
+                        "Time: %{x}<br>Decimal Odds: %{y:.3f}<br>"
+                        "Raw Probability: %{customdata[1]:.4f}<br>"
+                        "De-vigged Probability: %{customdata[2]:.4f}<extra></extra>"
                     )
-                except Exception as e:
-                    # If that fails, try without the marker
-                    pass
-                
-                fig.update_layout(
-                    height=600,
-                    xaxis_title="Time",
-                    yaxis_title="Decimal Odds",
-                    legend_title_text="Outcome / Platform"
+                ))
+            
+            # Legend-only entries explaining the platform symbols
+            for platform, symbol in zip(platforms, platform_symbols):
+                fig.add_trace(trace_type(
+                    x=[None],
+                    y=[None],
+                    mode='markers',
+                    name=platform,
+                    legendgroup='platforms',
+                    legendgrouptitle_text='Platform',
+                    marker=dict(color='gray', symbol=symbol)
+                ))
+            
+            # Add game start time line if we have the data
+            try:
+                game_start_time = pd.to_datetime(selected_game['game_start_time'])
+                # Convert to datetime object that Plotly can handle using .item() instead of deprecated .to_pydatetime()
+                if hasattr(game_start_time, 'item'):
+                    game_start_dt = game_start_time.item()
+                else:
+                    game_start_dt = game_start_time
+                fig.add_vline(
+                    x=game_start_dt,
+                    line_dash="dash",
+                    line_color="red",
+                    annotation_text="Game Start"
                 )
-                
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Summary statistics
-                st.subheader("Summary Statistics")
-                
-                summary_stats = chart_data.groupby(['outcome_type', 'platform_name']).agg({
-                    odds_type: ['min', 'max', 'mean', 'std', 'count']
-                }).round(3)
-                
-                summary_stats.columns = ['Min', 'Max', 'Mean', 'Std Dev', 'Count']
-                st.dataframe(summary_stats, use_container_width=True)
-            else:
-                st.warning("Please select at least one outcome to display.")
+            except Exception as e:
+                # If that fails, try without the marker
+                pass
+            
+            fig.update_layout(
+                title=f"{'Raw' if odds_type == 'decimal_odds' else 'De-vigged'} Decimal Odds Over Time",
+                height=600,
+                xaxis_title="Time",
+                xaxis_type='date',
+                yaxis_title="Decimal Odds",
+                legend=dict(groupclick='toggleitem')
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # Summary statistics
+            st.subheader("Summary Statistics")
+            
+            summary_stats = _summary_stats(game_id, tuple(sorted(chart_outcomes)), odds_type)
+            st.dataframe(summary_stats, use_container_width=True)
         else:
-            st.warning("No odds data available for charting.")
+            st.warning("Please select at least one outcome to display.")
+    else:
+        st.warning("No odds data available for charting.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file